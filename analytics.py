@@ -0,0 +1,93 @@
+# Every query takes the cursor to run on, the bot passes the shared one from database.py.
+# The bot-wide queries read the small CardStats table that record_round keeps
+# up to date, so they cost the same no matter how long the round history gets.
+# Per-player queries use the covering indexes on RoundHistory and only touch
+# that player's rows.
+
+
+# Function to get the white cards with the best win rate
+def card_win_rates(cursor, min_plays=5, limit=10, player_id=None):
+    if player_id is None:
+        cursor.execute(
+            """
+            SELECT c.card_text, c.pack_name, s.plays, s.wins, CAST(s.wins AS REAL) / s.plays AS win_rate
+            FROM CardStats AS s
+            JOIN HistoryCards AS c ON c.card_id = s.card_id
+            WHERE s.plays >= ?
+            ORDER BY win_rate DESC, s.plays DESC
+            LIMIT ?
+            """,
+            (min_plays, limit),
+        )
+        return cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT c.card_text, c.pack_name, s.plays, s.wins, s.win_rate
+        FROM (
+            SELECT white_card_id, COUNT(*) AS plays, SUM(won) AS wins, CAST(SUM(won) AS REAL) / COUNT(*) AS win_rate
+            FROM RoundHistory
+            WHERE player_id = ?
+            GROUP BY white_card_id
+            HAVING plays >= ?
+            ORDER BY win_rate DESC, plays DESC
+            LIMIT ?
+        ) AS s
+        JOIN HistoryCards AS c ON c.card_id = s.white_card_id
+        ORDER BY s.win_rate DESC, s.plays DESC
+        """,
+        (player_id, min_plays, limit),
+    )
+    return cursor.fetchall()
+
+
+# Function to get how often each pack's white cards are played and how often they win
+def pack_stats(cursor, limit=10):
+    cursor.execute(
+        """
+        SELECT COALESCE(c.pack_name, 'Unknown') AS pack, SUM(s.plays) AS plays, SUM(s.wins) AS wins,
+               CAST(SUM(s.wins) AS REAL) / SUM(s.plays) AS win_rate, COUNT(*) AS distinct_cards
+        FROM CardStats AS s
+        JOIN HistoryCards AS c ON c.card_id = s.card_id
+        GROUP BY pack
+        ORDER BY plays DESC
+        LIMIT ?
+        """,
+        (limit,),
+    )
+    return cursor.fetchall()
+
+
+# Function to get submission and win totals for a player
+def player_stats(cursor, player_id):
+    cursor.execute(
+        "SELECT COUNT(*), COALESCE(SUM(won), 0) FROM RoundHistory WHERE player_id = ?",
+        (player_id,),
+    )
+    submissions, wins = cursor.fetchone()
+    cursor.execute("SELECT COUNT(*) FROM Rounds WHERE czar_id = ?", (player_id,))
+    rounds_judged = cursor.fetchone()[0]
+    return {
+        "submissions": submissions,
+        "wins": wins,
+        "win_rate": wins / submissions if submissions else 0.0,
+        "rounds_judged": rounds_judged,
+    }
+
+
+# Function to measure Czar bias: how often a Czar picks each player out of the
+# cards that player submitted to them. Players far above the rest are favourites.
+def czar_bias(cursor, czar_id, min_submissions=5, limit=10):
+    cursor.execute(
+        """
+        SELECT player_id, COUNT(*) AS submissions, SUM(won) AS picks, CAST(SUM(won) AS REAL) / COUNT(*) AS pick_rate
+        FROM RoundHistory
+        WHERE czar_id = ?
+        GROUP BY player_id
+        HAVING submissions >= ?
+        ORDER BY pick_rate DESC
+        LIMIT ?
+        """,
+        (czar_id, min_submissions, limit),
+    )
+    return cursor.fetchall()
@@ -0,0 +1,81 @@
+# Benchmark for the round history analytics.
+# Fills a scratch database with random rounds and times every analytics query.
+#
+#   python benchmark_analytics.py                 # 10M submission rows
+#   python benchmark_analytics.py --rows 1000000
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from schema import create_tables
+from analytics import card_win_rates, pack_stats, player_stats, czar_bias
+
+
+def fill_history(cursor, rows, players=60, white_cards=5000, black_cards=1000, packs=50, round_size=8):
+    cursor.executemany(
+        "INSERT INTO HistoryCards (card_id, card_type, card_text, pack_name) VALUES (?, ?, ?, ?)",
+        [(i, "white", f"White card {i}", f"Pack {i % packs}") for i in range(1, white_cards + 1)]
+        + [(white_cards + i, "black", f"Black card {i}", f"Pack {i % packs}") for i in range(1, black_cards + 1)],
+    )
+
+    round_count = rows // round_size
+    cursor.executemany(
+        "INSERT INTO Rounds (round_id, black_card_id, czar_id) VALUES (?, ?, ?)",
+        ((round_id, white_cards + random.randint(1, black_cards), round_id % players) for round_id in range(1, round_count + 1)),
+    )
+
+    def submissions():
+        for round_id in range(1, round_count + 1):
+            czar_id = round_id % players
+            winner = random.randrange(round_size)
+            for seat in range(round_size):
+                player_id = (czar_id + seat + 1) % players
+                yield round_id, czar_id, player_id, random.randint(1, white_cards), int(seat == winner)
+
+    # Indexes are faster to build once over the full table than to maintain row by row
+    cursor.execute("DROP INDEX idx_history_player")
+    cursor.execute("DROP INDEX idx_history_czar")
+    cursor.executemany(
+        "INSERT INTO RoundHistory (round_id, czar_id, player_id, white_card_id, won) VALUES (?, ?, ?, ?, ?)",
+        submissions(),
+    )
+    create_tables(cursor)
+    cursor.execute("ANALYZE")
+    cursor.connection.commit()
+    return round_count * round_size
+
+
+def timed(name, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{name:<28} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the round history analytics")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="number of submission rows to generate")
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "benchmark.db"))
+        cursor = conn.cursor()
+        create_tables(cursor)
+
+        rows = timed("fill history", fill_history, cursor, args.rows)
+        print(f"{rows} submission rows")
+
+        timed("card_win_rates", card_win_rates, cursor)
+        timed("card_win_rates (player)", card_win_rates, cursor, min_plays=1, player_id=1)
+        timed("pack_stats", pack_stats, cursor)
+        timed("player_stats", player_stats, cursor, 1)
+        timed("czar_bias", czar_bias, cursor, 1)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
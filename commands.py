@@ -3,7 +3,9 @@ import discord
 from discord.ext import commands
 from main import bot, game_active, players, timer, decks, logger
 from game_logic import add_player, start_round
+from tournament import join_tournament, leave_tournament, start_tournament, end_tournament, format_standings, DEFAULT_TABLE_SIZE
 from database import conn, cursor
+from analytics import card_win_rates, pack_stats, player_stats, czar_bias
 from utils import graphql_query
 from thefuzz import fuzz
 import requests
@@ -212,6 +214,96 @@ async def end_game(interaction: discord.Interaction):
     await interaction.response.send_message("Game ended.", ephemeral=True)
 
 
+@bot.tree.command(name="jointournament", description="Join the tournament lobby")
+async def join_tournament_command(interaction: discord.Interaction):
+    try:
+        await join_tournament(interaction, interaction.user)
+    except Exception as e:
+        await interaction.response.send_message(f"An error occurred joining the tournament: {e}", ephemeral=True)
+
+
+@bot.tree.command(name="leavetournament", description="Leave the tournament")
+async def leave_tournament_command(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
+    if await leave_tournament(interaction.user.id):
+        await interaction.followup.send("You left the tournament.", ephemeral=True)
+    else:
+        await interaction.followup.send("You are not in the tournament.", ephemeral=True)
+
+
+@bot.tree.command(name="starttournament", description="Split the lobby into tables and start the tournament (admin only)")
+@commands.has_permissions(administrator=True)
+async def start_tournament_command(interaction: discord.Interaction, table_size: int = DEFAULT_TABLE_SIZE):
+    await start_tournament(interaction, table_size)
+
+
+@bot.tree.command(name="endtournament", description="End the tournament (admin only)")
+@commands.has_permissions(administrator=True)
+async def end_tournament_command(interaction: discord.Interaction):
+    await end_tournament(interaction)
+
+
+@bot.tree.command(name="standings", description="Show the tournament standings")
+async def standings(interaction: discord.Interaction):
+    await interaction.response.send_message(format_standings(), ephemeral=True)
+
+
+@bot.tree.command(name="cardstats", description="Show the white cards that win most often")
+async def card_stats(interaction: discord.Interaction, player: discord.Member = None, min_plays: int = 5):
+    try:
+        min_plays = max(1, min_plays)
+        player_id = player.id if player is not None else None
+        rows = card_win_rates(cursor, min_plays=min_plays, player_id=player_id)
+
+        results = "```\n"
+        if player is not None:
+            stats = player_stats(cursor, player.id)
+            results += (
+                f"{player.name}: {stats['wins']} wins from {stats['submissions']} cards "
+                f"({stats['win_rate']:.0%}), judged {stats['rounds_judged']} rounds\n"
+            )
+            favourites = czar_bias(cursor, player.id)
+            if favourites:
+                results += "Picks most often as Czar: " + ", ".join(
+                    f"{bot.get_user(picked_id).name if bot.get_user(picked_id) else picked_id} ({pick_rate:.0%})"
+                    for picked_id, _, _, pick_rate in favourites[:5]
+                ) + "\n"
+            results += "\n"
+
+        if not rows:
+            results += f"No cards played at least {min_plays} times yet.\n"
+        for card_text, pack_name, plays, wins, win_rate in rows:
+            results += f"{win_rate:.0%} ({wins}/{plays}) [{pack_name or 'Unknown'}] {card_text}\n"
+        results += "```"
+
+        if len(results) > 2000:  # Check for Discord's message length limit
+            results = results[:1990] + "...\n```"
+        await interaction.response.send_message(results, ephemeral=True)
+
+    except sqlite3.Error as e:
+        logger.error(f"Database error in cardstats: {e}")
+        await interaction.response.send_message(f"Database error: {e}", ephemeral=True)
+
+
+@bot.tree.command(name="packstats", description="Show which card packs are played and win most")
+async def pack_stats_command(interaction: discord.Interaction):
+    try:
+        rows = pack_stats(cursor)
+        if not rows:
+            await interaction.response.send_message("No rounds played yet.", ephemeral=True)
+            return
+
+        results = "```\n"
+        for pack, plays, wins, win_rate, distinct_cards in rows:
+            results += f"{pack}: {plays} plays, {wins} wins ({win_rate:.0%}), {distinct_cards} different cards\n"
+        results += "```"
+        await interaction.response.send_message(results, ephemeral=True)
+
+    except sqlite3.Error as e:
+        logger.error(f"Database error in packstats: {e}")
+        await interaction.response.send_message(f"Database error: {e}", ephemeral=True)
+
+
 @bot.event
 async def on_command_error(interaction: discord.Interaction, error):
     if isinstance(error, commands.CommandNotFound):
@@ -1,5 +1,7 @@
 import sqlite3
 
+from schema import create_tables
+
 DATABASE_NAME = "cards_against_humanity.db"
 DEFAULT_HAND_SIZE = 10
 
@@ -8,43 +10,7 @@ cursor = conn.cursor()
 
 
 def setup_database():
-    # Create Cards table
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS Cards (
-            card_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            pack_name TEXT,
-            card_type TEXT,
-            card_text TEXT,
-            enabled BOOLEAN DEFAULT TRUE
-        )
-        """
-    )
-    # Create Players table
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS Players (
-            player_id INTEGER PRIMARY KEY,
-            username TEXT,
-            wins INTEGER DEFAULT 0,
-            games_played INTEGER DEFAULT 0
-        )
-        """
-    )
-    # Create WinningCards table
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS WinningCards (
-            combination_id INTEGER PRIMARY KEY,
-            player_id INTEGER,
-            black_card_text TEXT,
-            white_card_text TEXT,
-            votes INTEGER DEFAULT 0,
-            FOREIGN KEY (player_id) REFERENCES Players(player_id)
-        )
-        """
-    )
-    conn.commit()
+    create_tables(cursor)
 
 
 def fetch_cards_from_db(card_type, pack_name=None, enabled_only=True):
@@ -60,3 +26,45 @@ def fetch_cards_from_db(card_type, pack_name=None, enabled_only=True):
 
     cursor.execute(query, params)
     return cursor.fetchall()
+
+
+# Function to get the history id of a card, adding it the first time it is seen
+def get_history_card_id(card_type, card_text, pack_name=None, cursor=cursor):
+    cursor.execute(
+        """
+        INSERT OR IGNORE INTO HistoryCards (card_type, card_text, pack_name)
+        VALUES (?, ?, COALESCE(?, (SELECT pack_name FROM Cards WHERE card_type = ? AND card_text = ? LIMIT 1)))
+        """,
+        (card_type, card_text, pack_name, card_type, card_text),
+    )
+    cursor.execute(
+        "SELECT card_id FROM HistoryCards WHERE card_type = ? AND card_text = ?", (card_type, card_text)
+    )
+    return cursor.fetchone()[0]
+
+
+# Function to store a finished round with every submission, not just the winner.
+# submissions is a list of (player_id, white_card_text, pack_name) tuples.
+def record_round(black_card_text, czar_id, submissions, winning_player_id, black_pack=None, cursor=cursor):
+    black_card_id = get_history_card_id("black", black_card_text, black_pack, cursor)
+    cursor.execute(
+        "INSERT INTO Rounds (black_card_id, czar_id) VALUES (?, ?)", (black_card_id, czar_id)
+    )
+    round_id = cursor.lastrowid
+    rows = [
+        (round_id, czar_id, player_id, get_history_card_id("white", card_text, pack_name, cursor), int(player_id == winning_player_id))
+        for player_id, card_text, pack_name in submissions
+    ]
+    cursor.executemany(
+        "INSERT INTO RoundHistory (round_id, czar_id, player_id, white_card_id, won) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    cursor.executemany(
+        """
+        INSERT INTO CardStats (card_id, plays, wins) VALUES (?, 1, ?)
+        ON CONFLICT (card_id) DO UPDATE SET plays = plays + 1, wins = wins + excluded.wins
+        """,
+        [(white_card_id, won) for _, _, _, white_card_id, won in rows],
+    )
+    cursor.connection.commit()
+    return round_id
@@ -1,5 +1,5 @@
-from main import bot, decks, game_active, card_czar, black_card, submitted_cards, timer, logger
-from database import fetch_cards_from_db, DEFAULT_HAND_SIZE, players, conn, cursor
+from main import bot, decks, game_active, card_czar, black_card, submitted_cards, players, timer, logger
+from database import fetch_cards_from_db, record_round, DEFAULT_HAND_SIZE, conn, cursor
 from utils import graphql_query
 
 import discord
@@ -101,30 +101,76 @@ async def add_player(interaction: discord.Interaction, user):
         await interaction.response.send_message(f"{user.mention} is already in the game!", ephemeral=True)
 
 
+# Function to draw white card texts. Prioritize database then API
+async def draw_white_cards(count):
+    if count <= 0:
+        return []
+
+    db_cards_raw = fetch_cards_from_db("white")
+    db_cards = [card[0] for card in db_cards_raw]
+    cards = random.sample(db_cards, k=min(count, len(db_cards)))
+
+    if count > len(cards):
+        api_cards = await fetch_cards("white", count - len(cards))
+        cards.extend(card["text"] for card in api_cards)
+    return cards
+
+
 # Function to deal cards to a player
 async def deal_cards(interaction: discord.Interaction, player_id, num_cards=DEFAULT_HAND_SIZE): # num_cards argument with default
     global players
 
     try:
         cards_to_deal = num_cards - len(players[player_id]["hand"])
-        if cards_to_deal <= 0:
-            return
-
-        db_cards_raw = fetch_cards_from_db("white")
-        db_cards = [card[0] for card in db_cards_raw]
-        random_cards = random.sample(db_cards, k=min(cards_to_deal, len(db_cards)))
-        players[player_id]["hand"].extend(random_cards)
-
-        cards_to_deal -= len(random_cards)
-        if cards_to_deal > 0:
-            api_cards = await fetch_cards("white", cards_to_deal)
-            players[player_id]["hand"].extend([card["text"] for card in api_cards])
+        players[player_id]["hand"].extend(await draw_white_cards(cards_to_deal))
 
     except Exception as e:
         logger.error(f"Error dealing cards: {e}")
         await interaction.response.send_message("An error occurred dealing cards.", ephemeral=True)
 
 
+# Function to pick a random black card. Prioritize Decks then database then API
+async def pick_black_card():
+    if decks:  # Prioritize cards from selected packs (if any)
+        selected_packs = [pack_name for pack_name, pack_data in decks.items() if pack_data.get("enabled", True)]
+        if selected_packs:
+            chosen_pack = random.choice(selected_packs)
+            black_card = random.choice(decks[chosen_pack]["black"])
+        else:
+            black_card = await fetch_cards("black")
+            black_card = black_card[0] if black_card else None
+    elif cursor.execute("SELECT card_text FROM Cards WHERE card_type = 'black' AND enabled = TRUE").fetchone(): # Check if the cursor returns any values
+        db_cards = cursor.fetchall()
+        black_card = random.choice(db_cards) if db_cards else None
+        black_card = black_card[0] if black_card else None  # Extract text and handle None
+    else:
+        black_card = (await fetch_cards("black"))[0]
+    return black_card
+
+
+# Function to find which selected pack a card came from (cards in hands are plain text)
+def card_pack(card_type, card_text):
+    for pack_name, pack_data in decks.items():
+        if any(card.get("text") == card_text for card in pack_data.get(card_type, [])):
+            return pack_name
+    return None
+
+
+# Function to store a finished round in the round history
+def save_round_history(black_card_text, czar_id, submitted_cards, winning_player_id):
+    try:
+        record_round(
+            black_card_text,
+            czar_id,
+            [(player_id, card_text, card_pack("white", card_text)) for player_id, card_text in submitted_cards.items()],
+            winning_player_id,
+            card_pack("black", black_card_text),
+        )
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"Database error saving round history: {e}")
+
+
 # Function to start a new round
 async def start_round(interaction: discord.Interaction):
     global game_active, card_czar, black_card, submitted_cards, players, decks
@@ -152,21 +198,7 @@ async def start_round(interaction: discord.Interaction):
         ephemeral=True,
     )
 
-    # Fetch a random black card. Prioritize Decks then database then API
-    if decks:  # Prioritize cards from selected packs (if any)
-        selected_packs = [pack_name for pack_name, pack_data in decks.items() if pack_data.get("enabled", True)]
-        if selected_packs:
-            chosen_pack = random.choice(selected_packs)
-            black_card = random.choice(decks[chosen_pack]["black"])
-        else:
-            black_card = await fetch_cards("black")
-            black_card = black_card[0] if black_card else None
-    elif cursor.execute("SELECT card_text FROM Cards WHERE card_type = 'black' AND enabled = TRUE").fetchone(): # Check if the cursor returns any values
-        db_cards = cursor.fetchall()
-        black_card = random.choice(db_cards) if db_cards else None
-        black_card = black_card[0] if black_card else None  # Extract text and handle None
-    else:
-        black_card = (await fetch_cards("black"))[0]
+    black_card = await pick_black_card()
 
     if black_card is None:
         await interaction.response.send_message("No black cards available. Game cannot start.")
@@ -209,6 +241,9 @@ async def start_round(interaction: discord.Interaction):
 async def on_interaction(interaction: discord.Interaction):
     global submitted_cards, black_card, players, card_czar
 
+    if (interaction.data or {}).get("custom_id", "").startswith("table:"):  # Tournament tables handle their own buttons
+        return
+
     if interaction.component.style == discord.ButtonStyle.blurple:
         player_id = interaction.user.id
 
@@ -245,6 +280,7 @@ async def on_interaction(interaction: discord.Interaction):
                 (winning_player_id, black_card["text"], winning_card),
             )
             conn.commit()
+            save_round_history(black_card["text"], card_czar, submitted_cards, winning_player_id)
 
             players[winning_player_id]["wins"] += 1
             players[winning_player_id]["games_played"] += 1
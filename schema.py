@@ -0,0 +1,104 @@
+# Table definitions, kept apart from database.py so scripts can build the
+# schema on their own connection without opening the bot's database.
+
+
+def create_tables(cursor):
+    # Create Cards table
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Cards (
+            card_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pack_name TEXT,
+            card_type TEXT,
+            card_text TEXT,
+            enabled BOOLEAN DEFAULT TRUE
+        )
+        """
+    )
+    # Create Players table
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Players (
+            player_id INTEGER PRIMARY KEY,
+            username TEXT,
+            wins INTEGER DEFAULT 0,
+            games_played INTEGER DEFAULT 0
+        )
+        """
+    )
+    # Create WinningCards table
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS WinningCards (
+            combination_id INTEGER PRIMARY KEY,
+            player_id INTEGER,
+            black_card_text TEXT,
+            white_card_text TEXT,
+            votes INTEGER DEFAULT 0,
+            FOREIGN KEY (player_id) REFERENCES Players(player_id)
+        )
+        """
+    )
+    # Create HistoryCards table, gives every card seen in a round a stable id
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS HistoryCards (
+            card_id INTEGER PRIMARY KEY,
+            card_type TEXT,
+            card_text TEXT,
+            pack_name TEXT,
+            UNIQUE (card_type, card_text)
+        )
+        """
+    )
+    # Create Rounds table
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS Rounds (
+            round_id INTEGER PRIMARY KEY,
+            black_card_id INTEGER,
+            czar_id INTEGER,
+            played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (black_card_id) REFERENCES HistoryCards(card_id)
+        )
+        """
+    )
+    # Create RoundHistory table, one row per submitted white card
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS RoundHistory (
+            round_id INTEGER,
+            czar_id INTEGER,
+            player_id INTEGER,
+            white_card_id INTEGER,
+            won INTEGER DEFAULT 0,
+            FOREIGN KEY (round_id) REFERENCES Rounds(round_id),
+            FOREIGN KEY (white_card_id) REFERENCES HistoryCards(card_id)
+        )
+        """
+    )
+    # Create CardStats table, running plays/wins per white card kept up to date by record_round
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS CardStats (
+            card_id INTEGER PRIMARY KEY,
+            plays INTEGER DEFAULT 0,
+            wins INTEGER DEFAULT 0,
+            FOREIGN KEY (card_id) REFERENCES HistoryCards(card_id)
+        )
+        """
+    )
+    # Fill CardStats from existing history the first time it is created
+    cursor.execute(
+        """
+        INSERT INTO CardStats (card_id, plays, wins)
+        SELECT white_card_id, COUNT(*), SUM(won) FROM RoundHistory
+        WHERE NOT EXISTS (SELECT 1 FROM CardStats)
+        GROUP BY white_card_id
+        """
+    )
+    # Covering indexes for the per-player analytics queries, so they never touch the table itself
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_player ON RoundHistory (player_id, white_card_id, won)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_czar ON RoundHistory (czar_id, player_id, won)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rounds_czar ON Rounds (czar_id)")
+    cursor.connection.commit()
@@ -0,0 +1,150 @@
+# Table seating and standings for tournaments. Plain data only, no Discord
+# objects, so the balancing rules can be tested on their own.
+import math
+
+
+MIN_TABLE_SIZE = 3  # Czar plus two players, smaller tables get merged into others
+MAX_TABLE_SIZE = 20
+DEFAULT_TABLE_SIZE = 8
+
+tables = {}  # Tournament tables, keyed by table id
+seats = {}  # Tournament player id -> table id
+
+# Tournament state shared by every table
+tournament = {
+    "entrants": {},  # player_id -> username and hand, kept apart from the main game's players
+    "active": False,
+    "table_size": DEFAULT_TABLE_SIZE,
+    "channel": None,
+    "waiting": [],  # Players not seated yet, seated at the next round boundary
+    "next_table_id": 1,
+    "wins": {},  # player_id -> tournament wins
+    "ranking": [],  # player ids ordered by wins, kept sorted as wins come in
+    "positions": {},  # player_id -> index in ranking
+    "standings_message": None,
+}
+
+
+# Function to work out how many tables a number of players needs. Tables stay at
+# MIN_TABLE_SIZE or more, even if that pushes them past table_size.
+def count_tables(total, table_size):
+    return max(1, min(math.ceil(total / table_size), total // MIN_TABLE_SIZE))
+
+
+# Function to split players into balanced tables (sizes differ by at most one)
+def split_into_tables(player_ids, table_size):
+    table_count = count_tables(len(player_ids), table_size)
+    return [player_ids[i::table_count] for i in range(table_count)]
+
+
+# Function to compute how many tables there should be and how big each one should be.
+# The target size always leaves room for every player, seated or waiting.
+def table_targets():
+    total = sum(len(table["players"]) for table in tables.values()) + len(tournament["waiting"])
+    table_count = count_tables(total, tournament["table_size"])
+    return table_count, math.ceil(total / table_count)
+
+
+def open_table(player_ids):
+    table_id = tournament["next_table_id"]
+    tournament["next_table_id"] += 1
+    tables[table_id] = {
+        "players": list(player_ids),
+        "czar_index": -1,
+        "card_czar": None,
+        "black_card": None,
+        "submitted_cards": {},
+        "submission_order": [],
+        "judging": False,
+        "round": 0,
+    }
+    for player_id in player_ids:
+        seats[player_id] = table_id
+    return table_id
+
+
+def close_table(table_id):
+    table = tables.pop(table_id)
+    for player_id in table["players"]:
+        seats.pop(player_id, None)
+    # Put them at the front of the queue so they are seated first
+    tournament["waiting"][:0] = table["players"]
+
+
+def unseat(table, player_id):
+    index = table["players"].index(player_id)
+    table["players"].pop(index)
+    table["submitted_cards"].pop(player_id, None)
+    seats.pop(player_id, None)
+    if index <= table["czar_index"]:  # Keep the Czar rotation on the same player
+        table["czar_index"] -= 1
+
+
+# Function to open new tables from the waiting queue when there are enough players
+def seat_waiting():
+    waiting = tournament["waiting"]
+    table_count, target = table_targets()
+    new_tables = []
+    while len(tables) < table_count and len(waiting) >= MIN_TABLE_SIZE:
+        new_tables.append(open_table(waiting[:target]))
+        del waiting[:target]
+    if not tables and len(waiting) >= 2:  # Too few for a full table, but enough to play
+        new_tables.append(open_table(waiting[:]))
+        waiting.clear()
+    return new_tables
+
+
+# Function to rebalance a table at its round boundary. Returns ids of newly opened tables.
+def rebalance_table(table_id):
+    table = tables[table_id]
+    waiting = tournament["waiting"]
+
+    table_count, target = table_targets()
+    # With too many tables only the smallest one closes, so full tables are never broken up for nothing
+    is_smallest = len(table["players"]) <= min(len(other["players"]) for other in tables.values())
+    if (len(tables) > table_count and is_smallest) or (len(table["players"]) < MIN_TABLE_SIZE and len(tables) > 1):
+        close_table(table_id)
+        return seat_waiting()
+
+    # Hand extra players to the queue, other tables pick them up at their next boundary
+    while len(table["players"]) > target:
+        player_id = table["players"][-1]
+        unseat(table, player_id)
+        waiting.insert(0, player_id)
+
+    while waiting and len(table["players"]) < target:
+        player_id = waiting.pop(0)
+        table["players"].append(player_id)
+        seats[player_id] = table_id
+
+    new_tables = seat_waiting()
+
+    # Leftovers too few for a table of their own and with no room elsewhere sit here, above target
+    room_elsewhere = sum(max(0, target - len(other["players"])) for other_id, other in tables.items() if other_id != table_id)
+    while len(waiting) > room_elsewhere:
+        player_id = waiting.pop(0)
+        table["players"].append(player_id)
+        seats[player_id] = table_id
+
+    if len(table["players"]) < 2:  # Need at least 2 players (1 Czar, 1 player)
+        close_table(table_id)
+        new_tables += seat_waiting()
+    return new_tables
+
+
+# Function to record a tournament win and move the winner up the ranking
+def record_win(player_id):
+    wins, ranking, positions = tournament["wins"], tournament["ranking"], tournament["positions"]
+    wins[player_id] = wins.get(player_id, 0) + 1
+    if player_id not in positions:
+        positions[player_id] = len(ranking)
+        ranking.append(player_id)
+
+    # A win adds a single point, so the winner only has to pass players it was tied with
+    index = positions[player_id]
+    while index > 0 and wins.get(ranking[index - 1], 0) < wins[player_id]:
+        ranking[index] = ranking[index - 1]
+        positions[ranking[index]] = index
+        index -= 1
+    ranking[index] = player_id
+    positions[player_id] = index
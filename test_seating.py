@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+import seating
+from seating import MIN_TABLE_SIZE, tables, seats, tournament
+
+
+@pytest.fixture(autouse=True)
+def reset_seating():
+    tables.clear()
+    seats.clear()
+    tournament["waiting"].clear()
+    tournament["next_table_id"] = 1
+    tournament["wins"] = {}
+    tournament["ranking"] = []
+    tournament["positions"] = {}
+    yield
+
+
+def start(player_count, table_size):
+    tournament["table_size"] = table_size
+    for player_ids in seating.split_into_tables(list(range(player_count)), table_size):
+        seating.open_table(player_ids)
+
+
+def play_boundaries(passes=3):
+    # Every table reaches its round boundary once per pass
+    for _ in range(passes):
+        for table_id in list(tables):
+            if table_id in tables:
+                seating.rebalance_table(table_id)
+
+
+def table_sizes():
+    return sorted(len(table["players"]) for table in tables.values())
+
+
+@pytest.mark.parametrize("player_count, table_size, expected", [
+    (4, 3, [4]),
+    (5, 3, [5]),
+    (6, 3, [3, 3]),
+    (7, 3, [3, 4]),
+    (17, 8, [5, 6, 6]),
+])
+def test_split_never_starts_tables_below_minimum(player_count, table_size, expected):
+    start(player_count, table_size)
+    assert table_sizes() == expected
+
+
+@pytest.mark.parametrize("player_count", range(2, 40))
+@pytest.mark.parametrize("table_size", [3, 4, 8])
+def test_everyone_is_seated_after_boundaries(player_count, table_size):
+    start(player_count, table_size)
+    play_boundaries()
+
+    assert tournament["waiting"] == []
+    assert sorted(seats) == list(range(player_count))
+    assert sum(table_sizes()) == player_count
+    if player_count >= MIN_TABLE_SIZE:
+        assert min(table_sizes()) >= MIN_TABLE_SIZE
+
+
+def test_rebalance_seats_late_joiners():
+    start(8, 4)
+    tournament["waiting"].extend([100, 101, 102, 103, 104])
+    play_boundaries()
+
+    assert tournament["waiting"] == []
+    assert len(seats) == 13
+    assert table_sizes() == [4, 4, 5]
+
+
+def test_rebalance_merges_tables_after_players_leave():
+    start(24, 8)
+    for table_id in (2, 3):
+        for player_id in list(tables[table_id]["players"])[:4]:
+            seating.unseat(tables[table_id], player_id)
+    play_boundaries()
+
+    assert tournament["waiting"] == []
+    assert len(seats) == 16
+    assert table_sizes() == [8, 8]
+    assert 1 in tables  # The full table is never broken up
+
+
+def test_unseat_keeps_czar_rotation():
+    start(5, 8)
+    table = tables[1]
+    table["czar_index"] = 2
+    czar = table["players"][2]
+    seating.unseat(table, table["players"][0])
+    assert table["players"][table["czar_index"]] == czar  # Next rotation moves on from the same Czar
+
+
+def test_record_win_keeps_ranking_sorted():
+    tournament["ranking"] = [1, 2, 3, 4]
+    tournament["positions"] = {1: 0, 2: 1, 3: 2, 4: 3}
+    for player_id in [3, 4, 4, 2, 4, 3, 3, 3, 5]:
+        seating.record_win(player_id)
+
+    ranking, wins = tournament["ranking"], tournament["wins"]
+    assert wins == {3: 4, 4: 3, 2: 1, 5: 1}
+    assert ranking[:2] == [3, 4]
+    assert sorted(ranking) == [1, 2, 3, 4, 5]
+    assert [wins.get(player_id, 0) for player_id in ranking] == sorted(wins.get(player_id, 0) for player_id in ranking)[::-1]
+    assert all(tournament["positions"][player_id] == index for index, player_id in enumerate(ranking))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_everyone_is_seated_after_random_joins_and_leaves(seed):
+    rng = random.Random(seed)
+    table_size = rng.choice([3, 4, 6, 8])
+    start(rng.randint(2, 30), table_size)
+    next_player_id = 1000
+    for _ in range(10):
+        for _ in range(rng.randint(0, 4)):
+            tournament["waiting"].append(next_player_id)
+            next_player_id += 1
+        for player_id in rng.sample(sorted(seats), k=min(len(seats), rng.randint(0, 3))):
+            seating.unseat(tables[seats[player_id]], player_id)
+        play_boundaries(passes=1)
+    play_boundaries()
+
+    total = len(seats) + len(tournament["waiting"])
+    assert tournament["waiting"] == [] or total < 2
+    if total >= MIN_TABLE_SIZE:
+        assert min(table_sizes()) >= MIN_TABLE_SIZE
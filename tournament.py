@@ -0,0 +1,347 @@
+from main import bot, timer, logger
+from database import DEFAULT_HAND_SIZE, conn, cursor
+from game_logic import draw_white_cards, pick_black_card, save_round_history
+from seating import (
+    MIN_TABLE_SIZE, MAX_TABLE_SIZE, DEFAULT_TABLE_SIZE, tables, seats, tournament,
+    split_into_tables, open_table, close_table, unseat, seat_waiting, rebalance_table, record_win,
+)
+
+import discord
+import sqlite3
+import asyncio
+
+
+STANDINGS_LIMIT = 20  # Rows shown in the standings message
+
+background_tasks = set()  # Keeps scheduled rounds alive until they finish
+
+
+# Function to run a round change in the background, so handlers can answer right away
+def schedule(coro):
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+def black_card_text(card):
+    if isinstance(card, tuple):
+        return card[0]
+    if isinstance(card, dict):
+        return card.get("text")
+    return card
+
+
+def format_standings(limit=STANDINGS_LIMIT):
+    wins = tournament["wins"]
+    lines = ["**Tournament Standings**"]
+    for rank, player_id in enumerate(tournament["ranking"][:limit], start=1):
+        entrant = tournament["entrants"].get(player_id)
+        username = entrant["username"] if entrant else str(player_id)
+        table_id = seats.get(player_id)
+        where = f"Table {table_id}" if table_id is not None else "waiting"
+        lines.append(f"{rank}. {username} - {wins.get(player_id, 0)} wins ({where})")
+    if len(tournament["ranking"]) > limit:
+        lines.append(f"...and {len(tournament['ranking']) - limit} more")
+    return "\n".join(lines)
+
+
+async def update_standings():
+    message = tournament["standings_message"]
+    if message is None:
+        return
+    try:
+        await message.edit(content=format_standings())
+    except discord.HTTPException as e:
+        logger.error(f"Error updating standings: {e}")
+
+
+# Function to add a player to the tournament queue
+async def join_tournament(interaction: discord.Interaction, user):
+    player_id = user.id
+    if player_id in seats or player_id in tournament["waiting"]:
+        await interaction.response.send_message(f"{user.mention} is already in the tournament!", ephemeral=True)
+        return
+
+    if player_id not in tournament["entrants"]:
+        tournament["entrants"][player_id] = {"username": user.name, "hand": []}
+        try:
+            cursor.execute(
+                "INSERT OR IGNORE INTO Players (player_id, username) VALUES (?, ?)",
+                (player_id, user.name),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Database error in join_tournament: {e}")
+            await interaction.response.send_message(f"An error occurred adding you to the tournament: {e}", ephemeral=True)
+            return
+
+    tournament["waiting"].append(player_id)
+    if player_id not in tournament["positions"]:
+        tournament["positions"][player_id] = len(tournament["ranking"])
+        tournament["ranking"].append(player_id)
+
+    if tournament["active"]:
+        await interaction.response.send_message(f"{user.mention} joined the tournament! You will be seated at the next round.", ephemeral=True)
+        for table_id in seat_waiting():
+            schedule(start_table_round(table_id))
+    else:
+        await interaction.response.send_message(f"{user.mention} joined the tournament lobby!", ephemeral=True)
+
+
+# Function to remove a player from the tournament, even in the middle of a round
+async def leave_tournament(player_id):
+    if player_id in tournament["waiting"]:
+        tournament["waiting"].remove(player_id)
+        return True
+    if player_id not in seats:
+        return False
+
+    table_id = seats[player_id]
+    table = tables[table_id]
+    was_czar = player_id == table["card_czar"]
+    unseat(table, player_id)
+
+    if not tournament["active"] or table["card_czar"] is None:
+        return True
+    if was_czar or len(table["players"]) < 2:
+        # Close the round so its buttons stop working, and give back the cards already played
+        table["card_czar"] = None
+        table["judging"] = False
+        for submitter_id, card_text in table["submitted_cards"].items():
+            tournament["entrants"][submitter_id]["hand"].append(card_text)
+        table["submitted_cards"] = {}
+        await tournament["channel"].send(f"**Table {table_id}:** Round cancelled, the Card Czar or the last player left.")
+        schedule(table_between_rounds(table_id))
+    elif not table["judging"] and table["submitted_cards"] and len(table["submitted_cards"]) == len(table["players"]) - 1:
+        await end_table_round(table_id)
+    return True
+
+
+async def start_tournament(interaction: discord.Interaction, table_size=DEFAULT_TABLE_SIZE):
+    if tournament["active"]:
+        await interaction.response.send_message("A tournament is already running!", ephemeral=True)
+        return
+    if not MIN_TABLE_SIZE <= table_size <= MAX_TABLE_SIZE:  # Enforce reasonable limits
+        await interaction.response.send_message(f"Table size must be between {MIN_TABLE_SIZE} and {MAX_TABLE_SIZE} players.", ephemeral=True)
+        return
+    if len(tournament["waiting"]) < 2:
+        await interaction.response.send_message("Need at least 2 players in the lobby. Use /jointournament to join.", ephemeral=True)
+        return
+
+    # Start the standings from scratch, with everyone in the lobby on zero wins
+    tournament["wins"] = {}
+    tournament["ranking"] = list(tournament["waiting"])
+    tournament["positions"] = {player_id: index for index, player_id in enumerate(tournament["ranking"])}
+
+    tournament["active"] = True
+    tournament["table_size"] = table_size
+    tournament["channel"] = interaction.channel
+
+    new_tables = [open_table(player_ids) for player_ids in split_into_tables(tournament["waiting"], tournament["table_size"])]
+    tournament["waiting"].clear()
+
+    await interaction.response.send_message(
+        f"**Tournament Start!** {sum(len(tables[table_id]['players']) for table_id in new_tables)} players at {len(new_tables)} tables."
+    )
+    tournament["standings_message"] = await interaction.channel.send(format_standings())
+    for table_id in new_tables:
+        schedule(start_table_round(table_id))
+
+
+async def end_tournament(interaction: discord.Interaction):
+    if not tournament["active"]:
+        await interaction.response.send_message("No tournament is running.", ephemeral=True)
+        return
+
+    tournament["active"] = False
+    # Move everyone back to the lobby so the next tournament can start with them
+    for table_id in list(tables):
+        close_table(table_id)
+    await update_standings()
+    tournament["standings_message"] = None
+    await interaction.response.send_message("Tournament ended.\n" + format_standings())
+
+
+# Function to start a new round at one table
+async def start_table_round(table_id):
+    table = tables[table_id]
+    channel = tournament["channel"]
+
+    for player_id in table["players"]:
+        await deal_hand(player_id)
+
+    table["czar_index"] = (table["czar_index"] + 1) % len(table["players"])
+    table["card_czar"] = table["players"][table["czar_index"]]
+    table["black_card"] = black_card_text(await pick_black_card())
+    table["submitted_cards"] = {}
+    table["submission_order"] = []
+    table["judging"] = False
+    table["round"] += 1
+
+    if table["black_card"] is None:
+        await channel.send(f"**Table {table_id}:** No black cards available. Table closed.")
+        close_table(table_id)
+        return
+
+    await channel.send(
+        f"**Table {table_id} - Round {table['round']}**\n{bot.get_user(table['card_czar']).mention} is the Card Czar.\n\n"
+        f"**Black Card:**\n{table['black_card']}"
+    )
+
+    # Send ephemeral messages to players with their white cards
+    await asyncio.gather(*(
+        send_hand(table_id, player_id) for player_id in table["players"] if player_id != table["card_czar"]
+    ))
+
+
+# Function to top up a tournament player's hand
+async def deal_hand(player_id):
+    hand = tournament["entrants"][player_id]["hand"]
+    try:
+        hand.extend(await draw_white_cards(DEFAULT_HAND_SIZE - len(hand)))
+    except Exception as e:
+        logger.error(f"Error dealing cards: {e}")
+
+
+async def send_hand(table_id, player_id):
+    table = tables[table_id]
+    cards = tournament["entrants"][player_id]["hand"]
+    message = "\n".join(f"{i+1}. {card}" for i, card in enumerate(cards))
+    view = discord.ui.View(timeout=None)
+    for i in range(len(cards)):
+        view.add_item(discord.ui.Button(
+            label=str(i + 1),
+            style=discord.ButtonStyle.blurple,
+            custom_id=f"table:{table_id}:{table['round']}:submit:{i}",
+        ))
+    try:
+        await bot.get_user(player_id).send(
+            f"**Table {table_id} - Black Card:**\n{table['black_card']}\n\n**Your White Cards:**\n{message}\n\nPlease select one card:",
+            view=view,
+        )
+    except discord.HTTPException as e:
+        logger.error(f"Error sending hand to {player_id}: {e}")
+
+
+# Function to handle card submissions and Czar selection at tournament tables
+@bot.listen("on_interaction")
+async def on_table_interaction(interaction: discord.Interaction):
+    custom_id = (interaction.data or {}).get("custom_id", "")
+    if not custom_id.startswith("table:"):
+        return
+
+    _, table_id, round_number, action, index = custom_id.split(":")
+    table_id, round_number, index = int(table_id), int(round_number), int(index)
+    player_id = interaction.user.id
+    table = tables.get(table_id)
+
+    if table is None or table["round"] != round_number or table["card_czar"] is None or seats.get(player_id) != table_id:
+        await interaction.response.send_message("This round is over.", ephemeral=True)
+        return
+
+    if action == "submit" and player_id != table["card_czar"] and not table["judging"]:
+        if player_id in table["submitted_cards"]:
+            await interaction.response.send_message("You already submitted a card this round.", ephemeral=True)
+            return
+        table["submitted_cards"][player_id] = tournament["entrants"][player_id]["hand"].pop(index)
+        # Decide before any await, so two last submissions can't both close the round
+        round_complete = len(table["submitted_cards"]) == len(table["players"]) - 1
+        if round_complete:
+            table["judging"] = True
+        await interaction.response.send_message("Card submitted successfully!", ephemeral=True)
+
+        if round_complete:
+            await end_table_round(table_id)
+
+    elif action == "pick" and player_id == table["card_czar"] and table["judging"]:
+        winning_player_id = table["submission_order"][index]
+        winning_card = table["submitted_cards"].get(winning_player_id)
+        if winning_card is None:  # The player left after submitting
+            await interaction.response.send_message("That player left the tournament, pick another card.", ephemeral=True)
+            return
+        table["judging"] = False
+        table["card_czar"] = None  # Round is over, leaving players no longer affect it
+
+        try:
+            # Update player stats in database
+            cursor.execute(
+                "UPDATE Players SET wins = wins + 1, games_played = games_played + 1 WHERE player_id = ?",
+                (winning_player_id,),
+            )
+            # Store winning combination
+            cursor.execute(
+                "INSERT INTO WinningCards (player_id, black_card_text, white_card_text) VALUES (?, ?, ?)",
+                (winning_player_id, table["black_card"], winning_card),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Database error recording tournament win: {e}")
+        save_round_history(table["black_card"], player_id, table["submitted_cards"], winning_player_id)
+
+        record_win(winning_player_id)
+
+        await interaction.response.send_message("Winner selected!", ephemeral=True)
+        await tournament["channel"].send(
+            f"**Table {table_id} - Winning Card:** {winning_card} submitted by {bot.get_user(winning_player_id).mention}"
+        )
+        await update_standings()
+        schedule(table_between_rounds(table_id))
+
+    else:
+        await interaction.response.send_message("You can't do that right now.", ephemeral=True)
+
+
+# Function to end a round at one table and send the submissions to its Czar
+async def end_table_round(table_id):
+    table = tables.get(table_id)
+    if table is None or table["card_czar"] is None:  # Round was cancelled while waiting
+        return
+    table["judging"] = True
+    table["submission_order"] = list(table["submitted_cards"])
+
+    cards_message = f"**Table {table_id} - Black Card:**\n{table['black_card']}\n\n**Submitted Cards:**\n"
+    for card_text in table["submitted_cards"].values():
+        cards_message += f"- {card_text}\n"
+    await tournament["channel"].send(cards_message)
+
+    view = discord.ui.View(timeout=None)
+    for i in range(len(table["submission_order"])):
+        view.add_item(discord.ui.Button(
+            label=f"Card {i + 1}",
+            style=discord.ButtonStyle.blurple,
+            custom_id=f"table:{table_id}:{table['round']}:pick:{i}",
+        ))
+    await bot.get_user(table["card_czar"]).send(f"**Select the winning card:**\n{cards_message}", view=view)
+
+
+async def table_between_rounds(table_id):
+    if not tournament["active"]:
+        return
+
+    await tournament["channel"].send(f"**Table {table_id}:** Next round in {timer} seconds.", delete_after=timer)
+    await asyncio.sleep(timer)
+
+    if not tournament["active"] or table_id not in tables:
+        return
+
+    # Drop players who left the server
+    table = tables[table_id]
+    for player_id in [player_id for player_id in table["players"] if bot.get_user(player_id) is None]:
+        unseat(table, player_id)
+
+    # Tables rebalance independently, so no table waits for the others to finish
+    new_tables = rebalance_table(table_id)
+    starting = [table_id] + new_tables if table_id in tables else new_tables
+    if not tables:
+        await tournament["channel"].send("Not enough players to keep a table going. Waiting for more players to /jointournament.")
+    await update_standings()
+    await asyncio.gather(*(start_table_round(starting_id) for starting_id in starting))
+
+
+# Function to handle tournament player disconnects
+@bot.listen("on_member_remove")
+async def on_tournament_member_remove(member):
+    await leave_tournament(member.id)